@@ -6,11 +6,19 @@ Ce module s'intègre dans le menu 'Édition' du Browser Anki
 pour permettre l'ajout automatique d'images aux notes sélectionnées.
 """
 
+import hashlib
 import json
 import os
 import re
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from html.parser import HTMLParser
+from typing import Optional, Dict, Any, List, Set, Tuple
 
+from anki.utils import ids2str
 from aqt import mw
 from aqt.browser import Browser
 from aqt.qt import (
@@ -18,23 +26,55 @@ from aqt.qt import (
     QLineEdit, QComboBox, QPushButton, QProgressDialog,
     QGroupBox, QTextEdit, QFrame, QSizePolicy, QGridLayout,
     QPixmap, QByteArray, QCursor, QScrollArea, QWidget,
-    Qt
+    QPixmapCache, QImageReader, QBuffer, QIODevice,
+    QTimer, QObject, QRunnable, QThreadPool, QUrl, pyqtSignal, Qt
 )
 from aqt.utils import showInfo, showWarning
 
-# Import local module
-from . import pixabay
+try:
+    from PyQt6.QtNetwork import (
+        QNetworkAccessManager, QNetworkReply, QNetworkRequest
+    )
+except ImportError:
+    from PyQt5.QtNetwork import (  # type: ignore
+        QNetworkAccessManager, QNetworkReply, QNetworkRequest
+    )
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # The media cache then uses the stdlib json module
+
+# Local pixabay module, imported on first use: it pulls in requests,
+# which is not needed until the dialog actually talks to Pixabay
+_pixabay_mod = None
+
+
+def _pixabay():
+    """Return the pixabay module, importing it on first call."""
+    global _pixabay_mod
+    if _pixabay_mod is None:
+        from . import pixabay as mod
+        _pixabay_mod = mod
+    return _pixabay_mod
+
+
+_IMG_RE = re.compile(r'<img\b', re.IGNORECASE)
 
 
 # ============================================================================
 # Configuration Management
 # ============================================================================
 
-def get_config() -> Dict[str, Any]:
-    """Load add-on configuration."""
-    addon_dir = os.path.dirname(__file__)
-    config_path = os.path.join(addon_dir, "config.json")
-    
+_ADDON_DIR = os.path.dirname(__file__)
+_CONFIG_PATH = os.path.join(_ADDON_DIR, "config.json")
+
+# Parsed configuration, loaded from disk on first use
+_CONFIG_CACHE: Optional[Dict[str, Any]] = None
+
+
+def _load_config_from_disk() -> Dict[str, Any]:
+    """Read config.json, filling in missing keys with defaults."""
     default_config = {
         "pixabay_api_key": "",
         "source_field": "Front",
@@ -43,7 +83,7 @@ def get_config() -> Dict[str, Any]:
     }
     
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
+        with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
             config = json.load(f)
             for key, value in default_config.items():
                 if key not in config:
@@ -53,78 +93,376 @@ def get_config() -> Dict[str, Any]:
         return default_config
 
 
+def get_config() -> Dict[str, Any]:
+    """Load add-on configuration (a copy, safe to modify)."""
+    global _CONFIG_CACHE
+    if _CONFIG_CACHE is None:
+        _CONFIG_CACHE = _load_config_from_disk()
+    return dict(_CONFIG_CACHE)
+
+
 def save_config(config: Dict[str, Any]) -> None:
-    """Save add-on configuration."""
-    addon_dir = os.path.dirname(__file__)
-    config_path = os.path.join(addon_dir, "config.json")
+    """Save add-on configuration (skipped when nothing changed)."""
+    global _CONFIG_CACHE
+    if config == _CONFIG_CACHE:
+        return
     
     try:
-        with open(config_path, "w", encoding="utf-8") as f:
+        with open(_CONFIG_PATH, "w", encoding="utf-8") as f:
             json.dump(config, f, indent=2, ensure_ascii=False)
+        # Only once written, so that a failed save is retried next time
+        _CONFIG_CACHE = dict(config)
     except Exception as e:
         print(f"Anki-Pix: Config save error - {e}")
 
 
+# ============================================================================
+# Media Cache
+# ============================================================================
+
+# Kept in user_files/, the only add-on folder preserved by Anki updates
+_MEDIA_CACHE_PATH = os.path.join(_ADDON_DIR, "user_files", "media_cache.json")
+
+
+# Maximum number of entries kept in each media cache map (least recently
+# used entries are dropped first)
+MEDIA_CACHE_SIZE = 5000
+
+# Pixabay image URLs expire after 24 hours; older search results still
+# name the file they were downloaded to, but are not downloaded again
+SEARCH_TTL = 24 * 60 * 60
+
+# Names of the media cache maps: "searches" ({search_cache_key():
+# [image URL, time searched]}) and "urls" ({image URL: filename})
+_MEDIA_CACHE_MAPS = ("searches", "urls")
+
+# Media cache maps, loaded from disk on first use, each in least to most
+# recently used order
+_MEDIA_CACHE: Optional[Dict[str, "OrderedDict[str, Any]"]] = None
+
+# Digest of the media cache file as last read or written, so that saving
+# an unchanged cache does not rewrite the file
+_media_cache_digest: Optional[bytes] = None
+
+
+def _digest(raw: bytes) -> bytes:
+    """Return a short digest of serialized cache contents."""
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _load_media_cache() -> Dict[str, "OrderedDict[str, Any]"]:
+    """Read the media cache file, with an empty map for missing ones."""
+    global _media_cache_digest
+    try:
+        with open(_MEDIA_CACHE_PATH, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+        _media_cache_digest = _digest(raw)
+    except Exception:
+        data = {}
+    return {
+        name: OrderedDict(data.get(name, {})) for name in _MEDIA_CACHE_MAPS
+    }
+
+
+def get_media_cache() -> Dict[str, "OrderedDict[str, Any]"]:
+    """Return the media cache maps of previously downloaded images."""
+    global _MEDIA_CACHE
+    if _MEDIA_CACHE is None:
+        _MEDIA_CACHE = _load_media_cache()
+    return _MEDIA_CACHE
+
+
+def remember(name: str, key: str, value: Any) -> None:
+    """Record (or refresh) an entry of the media cache map `name`."""
+    cache = get_media_cache()[name]
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > MEDIA_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def list_media_files(media_dir: str) -> Set[str]:
+    """Return the names of the files in the media folder."""
+    try:
+        with os.scandir(media_dir) as entries:
+            return {entry.name for entry in entries}
+    except OSError as e:
+        print(f"Anki-Pix: Media folder error - {e}")
+        return set()
+
+
+def search_cache_key(keyword: str, image_type: str) -> str:
+    """Return the media cache key of a Pixabay search."""
+    return "||".join((keyword, image_type, _pixabay().SEARCH_LANG)).lower()
+
+
+def save_media_cache() -> None:
+    """Write the media cache to disk, unless it is unchanged."""
+    global _media_cache_digest
+    if _MEDIA_CACHE is None:
+        return
+    data = _MEDIA_CACHE
+    try:
+        if orjson:
+            raw = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            raw = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        digest = _digest(raw)
+        if digest == _media_cache_digest:
+            return
+        os.makedirs(os.path.dirname(_MEDIA_CACHE_PATH), exist_ok=True)
+        with open(_MEDIA_CACHE_PATH, "wb") as f:
+            f.write(raw)
+        _media_cache_digest = digest
+    except Exception as e:
+        print(f"Anki-Pix: Media cache save error - {e}")
+
+
+# ============================================================================
+# Note Helpers
+# ============================================================================
+
+# Pixabay rejects search terms longer than 100 characters
+KEYWORD_MAX_LENGTH = 100
+
+
+class _EnoughText(Exception):
+    """Raised by _TextExtractor to stop parsing early."""
+
+
+class _TextExtractor(HTMLParser):
+    """Collect the text of an HTML fragment, up to `limit` visible characters."""
+    
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.chunks: List[str] = []
+        self.length = 0
+        self._skip = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+    
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+    
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self.chunks.append(data)
+        # Only non-whitespace counts, since whitespace runs are collapsed
+        self.length += sum(map(len, data.split()))
+        if self.length >= self.limit:
+            raise _EnoughText()
+
+
+def extract_text(html: str, limit: int = KEYWORD_MAX_LENGTH) -> str:
+    """
+    Extract plain text from HTML, with whitespace runs collapsed.
+    
+    Entities are decoded, <script>/<style> content and comments are
+    ignored and parsing stops as soon as `limit` characters are read.
+    """
+    parser = _TextExtractor(limit)
+    try:
+        parser.feed(html)
+        parser.close()
+    except _EnoughText:
+        pass
+    return " ".join("".join(parser.chunks).split())[:limit].strip()
+
+
+def note_keyword(content: str) -> str:
+    """
+    Return the keyword to search for a source field's content.
+    
+    Returns "" when the note needs no image: no text, or an image already
+    there. Keywords are lowercased, since Pixabay searches ignore case.
+    """
+    if _IMG_RE.search(content):
+        return ""
+    return extract_text(content).lower()
+
+
+# Field index by name, cached per note type id
+_FIELD_IDX_CACHE: Dict[int, Dict[str, int]] = {}
+
+
+def field_idx(mid: int, name: str) -> Optional[int]:
+    """Return the index of field `name` in note type `mid`, or None."""
+    mapping = _FIELD_IDX_CACHE.get(mid)
+    if mapping is None:
+        model = mw.col.models.get(mid)
+        flds = model["flds"] if model else []
+        mapping = {f["name"]: i for i, f in enumerate(flds)}
+        _FIELD_IDX_CACHE[mid] = mapping
+    return mapping.get(name)
+
+
+def iter_field_contents(nids: List[int], field_name: str):
+    """
+    Yield (nid, field content) for the notes having `field_name`.
+    
+    Reads all notes with a single SQL query instead of one get_note() each.
+    """
+    rows = mw.col.db.all(
+        f"select id, mid, flds from notes where id in {ids2str(nids)}"
+    )
+    for nid, mid, flds in rows:
+        idx = field_idx(mid, field_name)
+        if idx is None:
+            continue
+        fields = flds.split("\x1f")
+        if idx < len(fields):
+            yield nid, fields[idx]
+
+
+def on_operation_did_execute(changes, handler) -> None:
+    """Drop cached field indexes when a note type may have changed."""
+    if getattr(changes, "notetype", False):
+        _FIELD_IDX_CACHE.clear()
+
+
+# ============================================================================
+# Background Tasks
+# ============================================================================
+
+class WorkerSignals(QObject):
+    """Signals emitted by background tasks, delivered on the GUI thread."""
+    
+    finished = pyqtSignal(object)
+
+
+class SearchTask(QRunnable):
+    """Run pixabay.search_images in Qt's global thread pool."""
+    
+    def __init__(self, keyword: str, api_key: str, image_type: str, count: int = 5):
+        super().__init__()
+        self.keyword = keyword
+        self.api_key = api_key
+        self.image_type = image_type
+        self.count = count
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        images = _pixabay().search_images(
+            self.keyword, self.api_key, self.image_type, count=self.count
+        )
+        self.signals.finished.emit(images)
+
+
+class ConcurrencyTuner:
+    """
+    Adapt the number of concurrent Pixabay tasks to observed behaviour.
+    
+    Every `window` completed tasks, the limit is halved if any of them was
+    throttled, or raised by one if they were all fast.
+    """
+    
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 2,
+        maximum: int = 16,
+        window: int = 5,
+        fast_seconds: float = 0.4
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = max(minimum, min(maximum, initial))
+        self.window = window
+        self.fast_seconds = fast_seconds
+        self._durations: List[float] = []
+        self._errors = 0
+    
+    def record(self, duration: float, throttled: bool) -> None:
+        """Record one completed task and adjust the limit."""
+        self._durations.append(duration)
+        self._errors += throttled
+        if len(self._durations) < self.window:
+            return
+        
+        if self._errors:
+            self.limit = max(self.minimum, self.limit // 2)
+        elif max(self._durations) < self.fast_seconds:
+            self.limit = min(self.maximum, self.limit + 1)
+        self._durations = []
+        self._errors = 0
+
+
 # ============================================================================
 # Advanced Configuration Dialog
 # ============================================================================
 
+# Initial concurrent Pixabay tasks while applying images (network-bound
+# work); adjusted at runtime by ConcurrencyTuner
+MAX_WORKERS = 8
+
+# Attempts per keyword when Pixabay throttles the search
+MAX_ATTEMPTS = 3
+
+# Maximum number of notes scanned to estimate the status count
+STATUS_SAMPLE_SIZE = 500
+
 POSITION_OPTIONS = {
     "after": "Après le texte",
     "before": "Avant le texte",
     "replace": "Remplacer le texte"
 }
 
+# Build the new field HTML from (original content, image tag) per position
+POSITION_BUILDERS = {
+    "after": lambda original, img_tag: original + "<br>" + img_tag,
+    "before": lambda original, img_tag: img_tag + "<br>" + original,
+    "replace": lambda original, img_tag: img_tag,
+}
+
 
 class ClickableImageLabel(QLabel):
     """A QLabel that displays an image and is clickable."""
     
-    def __init__(self, image_data: dict, index: int, parent=None):
+    _STYLE_NORMAL = """
+        QLabel {
+            border: 3px solid #ddd;
+            border-radius: 8px;
+            background-color: #f9f9f9;
+        }
+        QLabel:hover {
+            border-color: #4a90d9;
+        }
+    """
+    
+    _STYLE_SELECTED = """
+        QLabel {
+            border: 3px solid #4CAF50;
+            border-radius: 8px;
+            background-color: #e8f5e9;
+        }
+    """
+    
+    def __init__(self, image_data: dict, index: int, parent=None, dialog=None):
         super().__init__(parent)
         self.image_data = image_data
         self.index = index
+        self._dialog = dialog
         self.selected = False
         self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.setFixedSize(150, 150)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.setStyleSheet("""
-            QLabel {
-                border: 3px solid #ddd;
-                border-radius: 8px;
-                background-color: #f9f9f9;
-            }
-            QLabel:hover {
-                border-color: #4a90d9;
-            }
-        """)
+        self.setStyleSheet(self._STYLE_NORMAL)
     
     def set_selected(self, selected: bool):
+        if selected == self.selected:
+            return
         self.selected = selected
-        if selected:
-            self.setStyleSheet("""
-                QLabel {
-                    border: 3px solid #4CAF50;
-                    border-radius: 8px;
-                    background-color: #e8f5e9;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QLabel {
-                    border: 3px solid #ddd;
-                    border-radius: 8px;
-                    background-color: #f9f9f9;
-                }
-                QLabel:hover {
-                    border-color: #4a90d9;
-                }
-            """)
+        self.setStyleSheet(self._STYLE_SELECTED if selected else self._STYLE_NORMAL)
     
     def mousePressEvent(self, event):
-        if self.parent() and hasattr(self.parent(), 'parent'):
-            dialog = self.parent().parent().parent().parent()
-            if hasattr(dialog, 'select_image'):
-                dialog.select_image(self.index)
+        if self._dialog is not None:
+            self._dialog.select_image(self.index)
 
 
 class ImagePreviewDialog(QDialog):
@@ -137,6 +475,10 @@ class ImagePreviewDialog(QDialog):
         self.selected_index = 0
         self.image_labels: List[ClickableImageLabel] = []
         self.selected_url: Optional[str] = None
+        self._nam = QNetworkAccessManager(self)
+        # Qt has no transfer timeout by default; a stalled thumbnail then
+        # fails (❌) after 5 s instead of waiting forever
+        self._nam.setTransferTimeout(5000)
         
         self._setup_ui()
         self._load_thumbnails()
@@ -164,7 +506,7 @@ class ImagePreviewDialog(QDialog):
         
         # Create image placeholders
         for i, img_data in enumerate(self.images):
-            label = ClickableImageLabel(img_data, i, container)
+            label = ClickableImageLabel(img_data, i, container, dialog=self)
             label.setText("⏳")
             self.image_labels.append(label)
             self.grid_layout.addWidget(label)
@@ -212,29 +554,59 @@ class ImagePreviewDialog(QDialog):
             self.tags_label.setText(f"Tags: {tags}")
     
     def _load_thumbnails(self):
-        """Load thumbnail images from URLs."""
-        try:
-            import requests
-        except ImportError:
-            return
-        
+        """Load thumbnail images from URLs, all requests in parallel."""
         for i, img_data in enumerate(self.images):
-            try:
-                response = requests.get(img_data["preview"], timeout=5)
-                if response.status_code == 200:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(QByteArray(response.content))
-                    scaled = pixmap.scaled(
-                        140, 140, 
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.image_labels[i].setPixmap(scaled)
-            except Exception as e:
-                self.image_labels[i].setText("❌")
-                print(f"Anki-Pix: Thumbnail load error - {e}")
+            # Reuse thumbnails already decoded for a previous preview
+            cached = QPixmapCache.find(img_data["preview"])
+            if cached is not None and not cached.isNull():
+                self.image_labels[i].setPixmap(cached)
+                continue
             
-            mw.app.processEvents()
+            # Qt performs the request asynchronously; the reply is handled
+            # on the main thread once finished
+            reply = self._nam.get(QNetworkRequest(QUrl(img_data["preview"])))
+            reply.finished.connect(partial(self._on_thumbnail_loaded, i, reply))
+    
+    def _on_thumbnail_loaded(self, index: int, reply) -> None:
+        """Display a downloaded thumbnail."""
+        try:
+            if reply.error() != QNetworkReply.NetworkError.NoError:
+                raise IOError(reply.errorString())
+            scaled = self._decode_thumbnail(reply.readAll())
+            QPixmapCache.insert(self.images[index]["preview"], scaled)
+            self.image_labels[index].setPixmap(scaled)
+        except Exception as e:
+            self.image_labels[index].setText("❌")
+            print(f"Anki-Pix: Thumbnail load error - {e}")
+        finally:
+            reply.deleteLater()
+    
+    @staticmethod
+    def _decode_thumbnail(data: QByteArray) -> QPixmap:
+        """
+        Decode image data to a pixmap fitting in 140x140.
+        
+        The target size is handed to the image reader so that decoders
+        supporting it (JPEG) decode at reduced size directly.
+        """
+        buffer = QBuffer()
+        buffer.setData(data)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buffer)
+        
+        size = reader.size()
+        if size.isValid():
+            size.scale(140, 140, Qt.AspectRatioMode.KeepAspectRatio)
+            reader.setScaledSize(size)
+            return QPixmap.fromImage(reader.read())
+        
+        pixmap = QPixmap()
+        pixmap.loadFromData(data)
+        return pixmap.scaled(
+            140, 140, 
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
     
     def get_selected_url(self) -> Optional[str]:
         """Return the URL of the selected image."""
@@ -252,10 +624,53 @@ class AnkiPixDialog(QDialog):
         self.available_fields: List[str] = []
         self.sample_note = None
         self.notes_to_process: List[tuple] = []
+        self._note_cache: Dict[int, Any] = {}
+        self._search_task: Optional[SearchTask] = None
+        # True while an apply run is working in the background
+        self._applying = False
+        
+        # Coalesce rapid combo-box changes into a single refresh
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(150)
+        self._preview_timer.timeout.connect(self._do_update_preview)
+        
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(150)
+        self._status_timer.timeout.connect(self._do_update_status)
         
         self._detect_fields()
         self._setup_ui()
-        self._update_preview()
+        self._shown = False
+    
+    def showEvent(self, event) -> None:
+        """Fill preview and status once the dialog has been painted."""
+        super().showEvent(event)
+        if not self._shown:
+            self._shown = True
+            QTimer.singleShot(
+                0, lambda: (self._do_update_preview(), self._do_update_status())
+            )
+    
+    def reject(self) -> None:
+        """Close the dialog, unless an apply run is still finishing."""
+        if not self._applying:
+            super().reject()
+    
+    def _set_applying(self, applying: bool) -> None:
+        """Lock the dialog while an apply run works in the background."""
+        self._applying = applying
+        for button in (self.apply_btn, self.test_btn, self.cancel_btn):
+            button.setEnabled(not applying)
+    
+    def _get_note(self, nid: int):
+        """Return the note for `nid`, fetching it from the collection once."""
+        note = self._note_cache.get(nid)
+        if note is None:
+            note = mw.col.get_note(nid)
+            self._note_cache[nid] = note
+        return note
     
     def _detect_fields(self) -> None:
         """Detect available fields from selected notes."""
@@ -263,8 +678,8 @@ class AnkiPixDialog(QDialog):
             return
         
         # Get first note to detect fields
-        self.sample_note = mw.col.get_note(self.selected_nids[0])
-        self.available_fields = [f["name"] for f in self.sample_note.note_type()["flds"]]
+        self.sample_note = self._get_note(self.selected_nids[0])
+        self.available_fields = list(self.sample_note.keys())
     
     def _setup_ui(self) -> None:
         self.setWindowTitle("Anki-Pix")
@@ -302,6 +717,7 @@ class AnkiPixDialog(QDialog):
         else:
             self.source_combo.addItems(["Front", "Back", "Source"])
         self.source_combo.currentTextChanged.connect(self._update_preview)
+        self.source_combo.currentTextChanged.connect(self._update_status)
         row1.addWidget(self.source_combo)
         params_layout.addLayout(row1)
         
@@ -365,7 +781,6 @@ class AnkiPixDialog(QDialog):
         self.status_label = QLabel()
         self.status_label.setStyleSheet("color: #666; font-style: italic;")
         layout.addWidget(self.status_label)
-        self._update_status()
         
         # === Buttons ===
         btn_layout = QHBoxLayout()
@@ -376,9 +791,9 @@ class AnkiPixDialog(QDialog):
         
         btn_layout.addStretch()
         
-        cancel_btn = QPushButton("Annuler")
-        cancel_btn.clicked.connect(self.reject)
-        btn_layout.addWidget(cancel_btn)
+        self.cancel_btn = QPushButton("Annuler")
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.cancel_btn)
         
         self.apply_btn = QPushButton("✓ Appliquer")
         self.apply_btn.setDefault(True)
@@ -392,16 +807,19 @@ class AnkiPixDialog(QDialog):
         if not self.sample_note:
             return ""
         try:
-            idx = self.available_fields.index(field_name)
-            return self.sample_note.fields[idx]
-        except (ValueError, IndexError):
+            return self.sample_note[field_name]
+        except KeyError:
             return ""
     
     def _extract_keyword(self, html: str) -> str:
-        """Extract plain text from HTML."""
-        return re.sub(r'<[^>]+>', '', html).strip()
+        """Extract the search keyword from a field's HTML."""
+        return extract_text(html)
     
     def _update_preview(self) -> None:
+        """Schedule a preview update, coalescing rapid successive changes."""
+        self._preview_timer.start()
+    
+    def _do_update_preview(self) -> None:
         """Update the preview based on current settings."""
         field_name = self.source_combo.currentText()
         content = self._get_field_content(field_name)
@@ -420,40 +838,34 @@ class AnkiPixDialog(QDialog):
             return
         
         img_tag = f'<img src="[📷 {keyword}]">'
-        
-        if position == "after":
-            preview = f'{content}<br>{img_tag}'
-        elif position == "before":
-            preview = f'{img_tag}<br>{content}'
-        else:  # replace
-            preview = img_tag
+        preview = POSITION_BUILDERS[position](content, img_tag)
         
         self.preview_text.setHtml(preview)
     
     def _update_status(self) -> None:
+        """Schedule a status update, coalescing rapid successive changes."""
+        self._status_timer.start()
+    
+    def _do_update_status(self) -> None:
         """Update the status label with count of notes to process."""
         field_name = self.source_combo.currentText()
         
         total = len(self.selected_nids)
+        sample = self.selected_nids[:STATUS_SAMPLE_SIZE]
         to_process = 0
         
-        for nid in self.selected_nids:
-            note = mw.col.get_note(nid)
-            field_names = [f["name"] for f in note.note_type()["flds"]]
-            
-            try:
-                idx = field_names.index(field_name)
-                content = note.fields[idx]
-                keyword = self._extract_keyword(content)
-                
-                # Has keyword and no image yet
-                if keyword and "<img" not in content.lower():
-                    to_process += 1
-            except ValueError:
-                pass
+        for nid, content in iter_field_contents(sample, field_name):
+            if note_keyword(content):
+                to_process += 1
+        
+        # Extrapolate from the sample on large selections
+        approx = ""
+        if total > len(sample):
+            to_process = int(to_process * total / len(sample))
+            approx = "~"
         
         self.status_label.setText(
-            f"📊 {to_process} note(s) à traiter sur {total} sélectionnée(s)"
+            f"📊 {approx}{to_process} note(s) à traiter sur {total} sélectionnée(s)"
         )
         self.notes_to_process_count = to_process
     
@@ -476,13 +888,20 @@ class AnkiPixDialog(QDialog):
         
         self.test_btn.setText("🔄 Recherche...")
         self.test_btn.setEnabled(False)
-        mw.app.processEvents()
-        
-        # Get multiple images
-        images = pixabay.search_images(keyword, api_key, image_type, count=5)
         
+        # Get multiple images without blocking the GUI thread
+        task = SearchTask(keyword, api_key, image_type, count=5)
+        task.signals.finished.connect(
+            lambda images: self._on_search_done(keyword, images)
+        )
+        self._search_task = task
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_search_done(self, keyword: str, images: list) -> None:
+        """Show the image preview once the background search is done."""
+        self._search_task = None
         self.test_btn.setText("🔍 Prévisualiser")
-        self.test_btn.setEnabled(True)
+        self.test_btn.setEnabled(not self._applying)
         
         if not images:
             showWarning(f"❌ Aucune image trouvée pour '{keyword}'")
@@ -513,71 +932,304 @@ class AnkiPixDialog(QDialog):
         image_type = self.config["image_type"]
         position = self.config["image_position"]
         
-        # Collect notes to process
-        notes_to_process = []
-        for nid in self.selected_nids:
-            note = mw.col.get_note(nid)
-            field_names = [f["name"] for f in note.note_type()["flds"]]
-            
-            try:
-                idx = field_names.index(field_name)
-                content = note.fields[idx]
-                keyword = self._extract_keyword(content)
-                
-                if keyword and "<img" not in content.lower():
-                    notes_to_process.append((note, idx, keyword, content))
-            except ValueError:
-                pass
-        
-        if not notes_to_process:
-            showInfo("Aucune note à traiter.")
-            return
-        
-        # Progress dialog
+        # Progress dialog, shown during collection already
         progress = QProgressDialog(
-            "Traitement...", "Annuler", 0, len(notes_to_process), self
+            "Collecte...", "Annuler", 0, len(self.selected_nids), self
         )
         progress.setWindowTitle("Anki-Pix")
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.show()
         
-        processed = 0
-        failed = 0
-        
-        for i, (note, idx, keyword, original) in enumerate(notes_to_process):
-            if progress.wasCanceled():
-                break
-            
-            progress.setValue(i)
-            progress.setLabelText(f"Recherche: {keyword}...")
-            mw.app.processEvents()
+        # Collect notes to process, grouped by keyword so that each
+        # distinct keyword is searched and downloaded only once
+        keyword_to_notes: Dict[str, List[Tuple[Any, str]]] = defaultdict(list)
+        contents = iter_field_contents(self.selected_nids, field_name)
+        for i, (nid, content) in enumerate(contents):
+            if i % 32 == 0:
+                progress.setValue(i)
+                if progress.wasCanceled():
+                    return
             
-            url = pixabay.search_image(keyword, api_key, image_type)
-            if not url:
-                failed += 1
-                continue
-            
-            filename = pixabay.download_to_anki(url, keyword, mw.col)
-            if not filename:
-                failed += 1
+            # Only the notes that will be updated are loaded as Note objects
+            keyword = note_keyword(content)
+            if keyword:
+                keyword_to_notes[keyword].append((self._get_note(nid), content))
+        
+        # A cancel clicked after the last periodic check
+        if progress.wasCanceled():
+            return
+        
+        if not keyword_to_notes:
+            progress.close()
+            showInfo("Aucune note à traiter.")
+            return
+        
+        # Reuse images downloaded for the same search by previous runs;
+        # one directory listing replaces a stat per cached filename
+        media_files = list_media_files(mw.col.media.dir())
+        media_cache = get_media_cache()
+        
+        # Workers get the image URLs of recent searches, so that they
+        # can skip the search; the caches are only updated on this thread
+        now = time.time()
+        cached: Dict[str, str] = {}
+        keywords: List[str] = []
+        known_searches: Dict[str, str] = {}
+        for keyword in keyword_to_notes:
+            key = search_cache_key(keyword, image_type)
+            entry = media_cache["searches"].get(key)
+            url, searched_at = entry if entry else (None, 0)
+            filename = media_cache["urls"].get(url)
+            if filename in media_files:
+                cached[keyword] = filename
+                remember("searches", key, entry)
+                remember("urls", url, filename)
                 continue
+            keywords.append(keyword)
+            if url and now - searched_at < SEARCH_TTL:
+                known_searches[keyword] = url
+        
+        progress.setLabelText("Traitement...")
+        progress.setMaximum(len(keywords))
+        progress.setValue(0)
+        
+        cancel_event = threading.Event()
+        progress.canceled.connect(cancel_event.set)
+        # Tasks in flight still have to return before the run ends
+        progress.canceled.connect(
+            lambda: self.status_label.setText("⏳ Annulation...")
+        )
+        
+        def report(value: int, maximum: int, label: str) -> None:
+            if not cancel_event.is_set():
+                progress.setMaximum(maximum)
+                progress.setValue(value)
+                progress.setLabelText(label)
+        
+        known_urls = dict(media_cache["urls"])
+        
+        # Third pipeline stage: media writes happen on the main thread as
+        # soon as each download completes, while other downloads go on
+        keyword_to_filename: Dict[str, str] = dict(cached)
+        write_failed: List[str] = []
+        
+        def store(keyword: str, fetched: Tuple[str, Any]) -> None:
+            url, payload = fetched
+            if isinstance(payload, str):
+                filename = payload
+            else:
+                # Names are content-addressed: an existing file is this image
+                image_bytes, name = payload
+                if name in media_files:
+                    filename = name
+                else:
+                    filename = _pixabay().write_to_anki(
+                        image_bytes, name, mw.col
+                    )
+            if filename:
+                media_files.add(filename)
+                keyword_to_filename[keyword] = filename
+                # A URL served from known_searches keeps its search time
+                key = search_cache_key(keyword, image_type)
+                entry = media_cache["searches"].get(key)
+                if not entry or known_searches.get(keyword) != url:
+                    entry = [url, time.time()]
+                remember("searches", key, entry)
+                remember("urls", url, filename)
+            else:
+                write_failed.append(keyword)
+        
+        def on_done(future) -> None:
+            self._set_applying(False)
+            try:
+                failed_keywords = future.result() + write_failed
+            except Exception as e:
+                # Still flush the images stored before the error; this
+                # already includes the keywords whose write failed
+                print(f"Anki-Pix: Processing error - {e}")
+                failed_keywords = [
+                    kw for kw in keywords if kw not in keyword_to_filename
+                ]
             
-            img_tag = f'<img src="{filename}">'
-            
-            if position == "after":
-                note.fields[idx] = f'{original}<br>{img_tag}'
-            elif position == "before":
-                note.fields[idx] = f'{img_tag}<br>{original}'
-            else:  # replace
-                note.fields[idx] = img_tag
+            save_media_cache()
+            self._finish_apply(
+                failed_keywords, progress, keyword_to_notes,
+                keyword_to_filename, field_name, position
+            )
+        
+        self._set_applying(True)
+        mw.taskman.run_in_background(
+            lambda: self._fetch_images(
+                keywords, api_key, image_type, known_searches, known_urls,
+                media_files, cancel_event, report, store
+            ),
+            on_done,
+        )
+    
+    def _refresh_browser(self) -> None:
+        """Redraw the browser rows instead of resetting its whole model."""
+        table = getattr(self.browser, "table", None)
+        if table is not None and hasattr(table, "redraw_cells"):
+            table.redraw_cells()
+        else:
+            self.browser.model.reset()
+    
+    @staticmethod
+    def _fetch_images(
+        keywords: List[str],
+        api_key: str,
+        image_type: str,
+        known_searches: Dict[str, str],
+        known_urls: Dict[str, str],
+        media_files: Set[str],
+        cancel_event: threading.Event,
+        report,
+        store
+    ) -> List[str]:
+        """
+        Search and download one image per keyword (runs in background).
+        
+        The number of tasks in flight follows a ConcurrencyTuner; keywords
+        throttled by Pixabay are retried up to MAX_ATTEMPTS times.
+        Keywords found in `known_searches` ({keyword: image URL}) skip the
+        search unless that URL can no longer be downloaded.
+        Each result is handed to `store(keyword, (url, payload))` on the
+        main thread as soon as it is available, where payload is either
+        the (image_bytes, filename) download or, for URLs found in
+        `known_urls` and still in `media_files`, the existing filename.
+        
+        Returns:
+            The keywords for which no image could be found or downloaded.
+        """
+        pixabay = _pixabay()
+        session = pixabay.get_session()
+        
+        # Keywords resolving to the same URL share a single download: the
+        # first worker fetches it into `downloaded`, the others wait on its
+        # {url: Event}
+        downloads: Dict[str, threading.Event] = {}
+        downloaded: Dict[str, Optional[Tuple[bytes, str]]] = {}
+        lock = threading.Lock()
+        
+        def fetch(keyword: str):
+            """Search and download one keyword's image (runs in a worker)."""
+            start = time.monotonic()
+            url = known_searches.get(keyword)
+            fetched = download_url(keyword, url) if url else None
+            if not fetched:
+                # Not searched before, or the cached image URL has expired
+                try:
+                    url = pixabay.search_image(
+                        keyword, api_key, image_type, session=session
+                    )
+                except pixabay.RateLimitError as e:
+                    print(f"Anki-Pix: Throttled - {e}")
+                    return None, time.monotonic() - start, True
+                if url:
+                    fetched = download_url(keyword, url)
+            return fetched, time.monotonic() - start, False
+        
+        def download_url(keyword: str, url: str):
+            """Return (url, payload) for `url`, or None on failure."""
+            # Image already downloaded from this URL by a previous run
+            known = known_urls.get(url)
+            if known in media_files:
+                return url, known
             
-            mw.col.update_note(note)
-            processed += 1
-        
-        progress.setValue(len(notes_to_process))
+            with lock:
+                done = downloads.get(url)
+                owner = done is None
+                if owner:
+                    done = downloads[url] = threading.Event()
+            if owner:
+                try:
+                    downloaded[url] = pixabay.download_image(
+                        url, keyword, session=session
+                    )
+                finally:
+                    done.set()
+            else:
+                done.wait()
+            result = downloaded.get(url)
+            return (url, result) if result else None
+        
+        failed: List[str] = []
+        tuner = ConcurrencyTuner(MAX_WORKERS)
+        queue = deque(keywords)
+        attempts: Dict[str, int] = defaultdict(int)
+        in_flight: Dict[Future, str] = {}
+        total = len(keywords)
+        done_count = 0
+        
+        with ThreadPoolExecutor(max_workers=tuner.maximum) as executor:
+            # Each task chains search and download, so a worker downloading
+            # one keyword's image overlaps with other keywords' searches
+            while (queue or in_flight) and not cancel_event.is_set():
+                while queue and len(in_flight) < tuner.limit:
+                    keyword = queue.popleft()
+                    attempts[keyword] += 1
+                    in_flight[executor.submit(fetch, keyword)] = keyword
+                
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    keyword = in_flight.pop(future)
+                    fetched, duration, throttled = future.result()
+                    tuner.record(duration, throttled)
+                    
+                    if throttled and attempts[keyword] < MAX_ATTEMPTS:
+                        queue.append(keyword)
+                        continue
+                    
+                    mw.taskman.run_on_main(
+                        lambda i=done_count, kw=keyword: report(
+                            i, total, f"Image: {kw}..."
+                        )
+                    )
+                    done_count += 1
+                    
+                    if fetched:
+                        mw.taskman.run_on_main(
+                            lambda kw=keyword, fetched=fetched: store(kw, fetched)
+                        )
+                    else:
+                        failed.append(keyword)
+        
+        return failed
+    
+    def _finish_apply(
+        self,
+        failed_keywords: List[str],
+        progress: QProgressDialog,
+        keyword_to_notes: Dict[str, List[Tuple[Any, str]]],
+        keyword_to_filename: Dict[str, str],
+        field_name: str,
+        position: str
+    ) -> None:
+        """Write the stored images into notes (runs on the main thread)."""
         progress.close()
+        failed = sum(len(keyword_to_notes[kw]) for kw in failed_keywords)
         
-        self.browser.model.reset()
+        # Fan each filename back out to every note sharing the keyword
+        updated_notes = []
+        build = POSITION_BUILDERS[position]
+        for keyword, filename in keyword_to_filename.items():
+            img_tag = f'<img src="{filename}">'
+            
+            for note, original in keyword_to_notes[keyword]:
+                note[field_name] = build(original, img_tag)
+                updated_notes.append(note)
+        
+        # Write all notes in a single batch instead of one commit per note
+        if updated_notes:
+            if hasattr(mw.col, "update_notes"):
+                mw.col.update_notes(updated_notes)
+            else:
+                for note in updated_notes:
+                    mw.col.update_note(note)
+        processed = len(updated_notes)
+        
+        if processed:
+            self._refresh_browser()
         
         showInfo(
             f"Traitement terminé!\n\n"
@@ -624,6 +1276,26 @@ def on_browser_setup_menus(browser: Browser) -> None:
 # ============================================================================
 
 from aqt import gui_hooks
-gui_hooks.browser_menus_did_init.append(on_browser_setup_menus)
+
+# Room for decoded preview thumbnails, in KB
+QPixmapCache.setCacheLimit(51200)
+
+
+def register_hook(hook, callback) -> None:
+    """
+    Append `callback` to `hook` exactly once.
+    
+    A re-imported add-on module defines new function objects, so copies
+    left by a previous import are matched by module and name and replaced.
+    """
+    for existing in list(getattr(hook, "_hooks", [])):
+        if (getattr(existing, "__module__", None) == callback.__module__
+                and getattr(existing, "__qualname__", None) == callback.__qualname__):
+            hook.remove(existing)
+    hook.append(callback)
+
+
+register_hook(gui_hooks.browser_menus_did_init, on_browser_setup_menus)
+register_hook(gui_hooks.operation_did_execute, on_operation_did_execute)
 
 print("Anki-Pix: Add-on chargé avec succès!")
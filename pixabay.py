@@ -6,24 +6,152 @@ Provides functions to search and download images from Pixabay,
 optimized for integration with Anki's media system.
 """
 
+import hashlib
 import os
-import uuid
+import re
+from functools import lru_cache
 from typing import Optional, Tuple
+from urllib.parse import quote_plus, urlencode
 
 try:
     import requests
 except ImportError:
     requests = None  # Will be handled at runtime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Falls back to the stdlib parser used by requests
+
 
 PIXABAY_API_URL = "https://pixabay.com/api/"
 
+# Language of the search terms sent to Pixabay
+SEARCH_LANG = "fr"
+
+# Hits requested when looking for an illustration among all image types
+ILLUSTRATION_CANDIDATES = 20
+
+# Read size used when streaming image downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Characters replaced by "_" in generated filenames: anything but letters
+# and digits (\w also matches "_", which maps to itself)
+_UNSAFE_CHAR_RE = re.compile(r"\W")
+
+
+class RateLimitError(Exception):
+    """Pixabay throttled the request (HTTP 429) or is overloaded (5xx)."""
+
+
+def _json(response):
+    """Decode a JSON response, with orjson when it is available."""
+    if orjson:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# search_image() only needs these two fields of a search response
+_TOTAL_HITS_RE = re.compile(rb'"totalHits"\s*:\s*(\d+)')
+_WEBFORMAT_URL_RE = re.compile(rb'"webformatURL"\s*:\s*"([^"]*)"')
+
+
+def _first_hit(response) -> Tuple[int, Optional[str]]:
+    """
+    Return the totalHits and first webformatURL of a search response.
+    
+    Both are picked out of the raw body with regexes; the full JSON is
+    only decoded when that fails (e.g. an escaped character in the URL).
+    """
+    body = response.content
+    total = _TOTAL_HITS_RE.search(body)
+    if total:
+        hits = int(total.group(1))
+        if hits == 0:
+            return 0, None
+        url = _WEBFORMAT_URL_RE.search(body)
+        if url and b"\\" not in url.group(1):
+            return hits, url.group(1).decode("utf-8")
+    
+    data = _json(response)
+    hits = data.get("totalHits", 0)
+    return hits, data["hits"][0]["webformatURL"] if hits > 0 else None
+
+
+@lru_cache(maxsize=8)
+def _search_url_prefix(api_key: str, per_page: int) -> str:
+    """Return the encoded search URL up to the per-search parameters."""
+    params = {
+        "key": api_key,
+        "lang": SEARCH_LANG,
+        "safesearch": "true",
+        "per_page": per_page,
+    }
+    return f"{PIXABAY_API_URL}?{urlencode(params)}"
+
+
+def _search_url(
+    keyword: str,
+    api_key: str,
+    image_type: str,
+    per_page: int
+) -> str:
+    """Return the search URL for a keyword; only `q` is encoded per call."""
+    prefix = _search_url_prefix(api_key, per_page)
+    return f"{prefix}&image_type={image_type}&q={quote_plus(keyword)}"
+
+
+def _raise_for_status(response) -> None:
+    """Like response.raise_for_status(), with RateLimitError for throttling."""
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RateLimitError(f"HTTP {response.status_code}")
+    response.raise_for_status()
+
+
+# Shared HTTP session, so that connections to Pixabay are kept alive
+_HTTP_SESSION = None
+
+USER_AGENT = "anki-pix/1.0"
+
+# Statuses retried by the session before giving up with a RetryError
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def get_session():
+    """
+    Return the shared requests.Session, creating it on first use.
+    
+    The connection pool is sized for the concurrent workers of the add-on,
+    and transient connection errors and throttled responses (429/5xx) are
+    retried with a short backoff, honouring Retry-After.
+    """
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None and requests:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=RETRY_STATUSES,
+            ),
+        )
+        session.mount("https://", adapter)
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
 
 def search_images(
     keyword: str,
     api_key: str,
     image_type: str = "photo",
-    count: int = 5
+    count: int = 5,
+    session=None
 ) -> list:
     """
     Search for multiple images on Pixabay.
@@ -33,6 +161,7 @@ def search_images(
         api_key: Pixabay API key.
         image_type: Type of image.
         count: Number of images to return.
+        session: requests.Session to use (defaults to the shared one).
         
     Returns:
         List of dicts with 'preview' (thumbnail) and 'url' (full size) keys.
@@ -40,19 +169,13 @@ def search_images(
     if not requests or not api_key:
         return []
     
-    params = {
-        "key": api_key,
-        "q": keyword,
-        "image_type": image_type,
-        "lang": "fr",
-        "safesearch": "true",
-        "per_page": count,
-    }
+    url = _search_url(keyword, api_key, image_type, count)
+    http = session or get_session()
     
     try:
-        response = requests.get(PIXABAY_API_URL, params=params, timeout=10)
+        response = http.get(url, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = _json(response)
         
         results = []
         for hit in data.get("hits", []):
@@ -72,7 +195,8 @@ def search_images(
 def search_image(
     keyword: str,
     api_key: str,
-    image_type: str = "photo"
+    image_type: str = "photo",
+    session=None
 ) -> Optional[str]:
     """
     Search for an image on Pixabay.
@@ -81,9 +205,14 @@ def search_image(
         keyword: The search term.
         api_key: Pixabay API key.
         image_type: Type of image ("illustration", "photo", "vector", "all").
+        session: requests.Session to use (defaults to the shared one).
         
     Returns:
         URL of the found image, or None if not found.
+        
+    Raises:
+        RateLimitError: Pixabay throttled the request; callers may retry
+            later with fewer concurrent requests.
     """
     if not requests:
         print("Anki-Pix: requests module not available")
@@ -93,44 +222,60 @@ def search_image(
         print("Anki-Pix: API key not configured")
         return None
     
-    params = {
-        "key": api_key,
-        "q": keyword,
-        "image_type": image_type,
-        "lang": "fr",
-        "safesearch": "true",
-        "per_page": 3,
-    }
+    if image_type == "illustration":
+        # Search all types at once rather than retrying with photos when
+        # no illustration is found; an illustration ranked below the first
+        # ILLUSTRATION_CANDIDATES hits is missed in favour of a photo
+        url = _search_url(keyword, api_key, "all", ILLUSTRATION_CANDIDATES)
+    else:
+        url = _search_url(keyword, api_key, image_type, 3)
+    http = session or get_session()
     
     try:
-        response = requests.get(PIXABAY_API_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        response = http.get(url, timeout=10)
+        _raise_for_status(response)
         
-        # Fallback to photo if no illustrations found
-        if data.get("totalHits", 0) == 0 and image_type == "illustration":
-            params["image_type"] = "photo"
-            response = requests.get(PIXABAY_API_URL, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+        if image_type != "illustration":
+            return _first_hit(response)[1]
         
-        if data.get("totalHits", 0) > 0:
-            return data["hits"][0]["webformatURL"]
+        hits = _json(response).get("hits", [])
+        by_type = {}
+        for hit in hits:
+            by_type.setdefault(hit.get("type"), hit["webformatURL"])
+        if "illustration" in by_type:
+            return by_type["illustration"]
+        if "photo" in by_type or not hits:
+            return by_type.get("photo")
         
-        return None
+        # Only vectors among the candidates: ask for photos explicitly
+        response = http.get(
+            _search_url(keyword, api_key, "photo", 3), timeout=10
+        )
+        _raise_for_status(response)
+        return _first_hit(response)[1]
         
+    except RateLimitError:
+        raise
+    except requests.exceptions.RetryError as e:
+        # The session already retried the throttled request
+        raise RateLimitError(str(e)) from e
     except Exception as e:
         print(f"Anki-Pix: Search error - {e}")
         return None
 
 
-def download_image(url: str, keyword: str) -> Optional[Tuple[bytes, str]]:
+def download_image(
+    url: str,
+    keyword: str,
+    session=None
+) -> Optional[Tuple[bytes, str]]:
     """
     Download an image from URL.
     
     Args:
         url: The image URL.
         keyword: The keyword (for filename generation).
+        session: requests.Session to use (defaults to the shared one).
         
     Returns:
         Tuple of (image_bytes, filename) or None on error.
@@ -138,32 +283,47 @@ def download_image(url: str, keyword: str) -> Optional[Tuple[bytes, str]]:
     if not requests:
         return None
     
+    http = session or get_session()
+    
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # Determine extension from Content-Type
-        content_type = response.headers.get("Content-Type", "")
-        if "png" in content_type:
-            ext = ".png"
-        elif "gif" in content_type:
-            ext = ".gif"
-        else:
-            ext = ".jpg"
+        # Stream the body, so that the headers can be checked before it is
+        # read and the connection goes back to the pool right after
+        with http.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            
+            # Determine extension from Content-Type, before reading the body
+            content_type = response.headers.get("Content-Type", "")
+            if "png" in content_type:
+                ext = ".png"
+            elif "gif" in content_type:
+                ext = ".gif"
+            else:
+                ext = ".jpg"
+            
+            # Images are already compressed and normally served as is;
+            # only then can the raw socket stream skip requests' decoder
+            if "Content-Encoding" in response.headers:
+                chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            else:
+                chunks = response.raw.stream(
+                    DOWNLOAD_CHUNK_SIZE, decode_content=False
+                )
+            image_bytes = b"".join(chunks)
         
-        # Generate unique filename
-        unique_id = uuid.uuid4().hex[:8]
-        safe_keyword = "".join(c if c.isalnum() else "_" for c in keyword)
-        filename = f"anki_pix_{safe_keyword}_{unique_id}{ext}"
+        # Name the file after its content, so that the same image
+        # downloaded again maps to the file already in the media folder
+        digest = hashlib.blake2b(image_bytes, digest_size=8).hexdigest()
+        safe_keyword = _UNSAFE_CHAR_RE.sub("_", keyword)
+        filename = f"anki_pix_{safe_keyword}_{digest}{ext}"
         
-        return (response.content, filename)
+        return (image_bytes, filename)
         
     except Exception as e:
         print(f"Anki-Pix: Download error - {e}")
         return None
 
 
-def download_to_anki(url: str, keyword: str, col) -> Optional[str]:
+def download_to_anki(url: str, keyword: str, col, session=None) -> Optional[str]:
     """
     Download an image and add it to Anki's media folder.
     
@@ -171,16 +331,33 @@ def download_to_anki(url: str, keyword: str, col) -> Optional[str]:
         url: The image URL.
         keyword: The keyword (for filename generation).
         col: Anki collection object (mw.col).
+        session: requests.Session to use (defaults to the shared one).
         
     Returns:
         The filename in Anki's media folder, or None on error.
     """
-    result = download_image(url, keyword)
+    result = download_image(url, keyword, session)
     if not result:
         return None
     
     image_bytes, filename = result
+    return write_to_anki(image_bytes, filename, col)
+
+
+def write_to_anki(image_bytes: bytes, filename: str, col) -> Optional[str]:
+    """
+    Add already downloaded image bytes to Anki's media folder.
+    
+    Must be called from the main thread, unlike download_image().
     
+    Args:
+        image_bytes: The image content.
+        filename: The desired filename.
+        col: Anki collection object (mw.col).
+        
+    Returns:
+        The filename in Anki's media folder, or None on error.
+    """
     try:
         # Add to Anki's media folder
         # col.media.write_data() returns the actual filename used